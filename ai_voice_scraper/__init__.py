@@ -1,4 +0,0 @@
-"""
-AI Voice Scraper package for monitoring AI voice technology news and discussions
-"""
-__version__ = '0.1.0'
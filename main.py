@@ -2,6 +2,7 @@
 AI Voice News Scraper - Main Entry Point
 """
 import asyncio
+import importlib
 import logging
 import os
 import sys
@@ -33,60 +34,75 @@ async def run_pipeline(logger):
     # Import components
     try:
         from scrapers.news_scraper import scrape_news_sources
-        from scrapers.reddit_scraper import scrape_reddit
-        from processors.content_processor import process_content
-        from storage.db_manager import store_news_item, store_reaction, store_run_summary
-        from notifiers.slack_notifier import send_slack_digest
-        from notifiers.email_notifier import send_email_digest  # Fixed import
-        from processors.trends_analyzer import analyze_current_trends
+        from processors.content_processor import process_content, create_article_session
+        from storage.db_manager import store_news_items, store_reactions
     except ImportError as e:
         logger.error(f"Import error: {e}")
         return {"error": str(e)}
     
-    # Step 1: Scrape news
-    logger.info("📰 Scraping news sources...")
-    try:
-        news_items = await scrape_news_sources()
-        logger.info(f"Found {len(news_items)} articles")
-    except Exception as e:
-        logger.error(f"News scraping failed: {e}")
-        news_items = []
-    
-    # Step 2: Process content
-    logger.info("🔍 Processing content...")
-    processed_items = []
-    for item in news_items:
+    async def collect_news(session):
+        """Steps 1-2: scrape news sources and process the articles"""
+        # Step 1: Scrape news
+        logger.info("📰 Scraping news sources...")
         try:
-            processed = await process_content(item)
-            if processed:
-                processed_items.append(processed)
-                await store_news_item(processed)
+            news_items = await scrape_news_sources(session=session)
+            logger.info(f"Found {len(news_items)} articles")
         except Exception as e:
-            logger.error(f"Error processing {item.get('title', 'Unknown')}: {e}")
+            logger.error(f"News scraping failed: {e}")
+            news_items = []
+        
+        # Step 2: Process content - articles are fetched concurrently over the shared session
+        logger.info("🔍 Processing content...")
+        semaphore = asyncio.Semaphore(10)
+        
+        async def process_item(item):
+            async with semaphore:
+                try:
+                    return await process_content(item, session=session)
+                except Exception as e:
+                    logger.error(f"Error processing {item.get('title', 'Unknown')}: {e}")
+                    return None
+        
+        results = await asyncio.gather(*(process_item(item) for item in news_items))
+        processed_items = [processed for processed in results if processed]
+        if processed_items:
+            await store_news_items(processed_items)
+        
+        logger.info(f"Processed {len(processed_items)} relevant articles")
+        return news_items, processed_items
     
-    logger.info(f"Processed {len(processed_items)} relevant articles")
+    async def collect_reddit():
+        """Step 3: scrape Reddit"""
+        reactions = []
+        total_reddit_scanned = 0
+        if os.getenv('REDDIT_CLIENT_ID') and os.getenv('REDDIT_CLIENT_SECRET'):
+            logger.info("💬 Scraping Reddit for AI voice topics...")
+            try:
+                # praw/requests only when configured - and imported off the event loop, since
+                # loading them is slow enough to stall the concurrent news collection
+                reddit_scraper = await asyncio.to_thread(importlib.import_module, 'scrapers.reddit_scraper')
+                reactions = await reddit_scraper.scrape_reddit()
+                
+                if reactions and '_metadata' in reactions[0]:
+                    metadata = reactions[0]['_metadata']
+                    total_reddit_scanned = metadata.get('total_scanned', 0)
+                    logger.info(f"📊 Reddit scanning stats: {total_reddit_scanned} posts scanned, {len(reactions)} relevant")
+                    del reactions[0]['_metadata']
+                
+                if reactions:
+                    await store_reactions(reactions)
+                logger.info(f"Found {len(reactions)} Reddit posts about AI voice")
+            except Exception as e:
+                logger.error(f"Reddit scraping failed: {e}")
+        else:
+            logger.info("Reddit API credentials not configured, skipping Reddit scraping")
+        return reactions, total_reddit_scanned
     
-    # Step 3: Scrape Reddit
-    reactions = []
-    total_reddit_scanned = 0
-    if os.getenv('REDDIT_CLIENT_ID') and os.getenv('REDDIT_CLIENT_SECRET'):
-        logger.info("💬 Scraping Reddit for AI voice topics...")
-        try:
-            reactions = await scrape_reddit()
-            
-            if reactions and '_metadata' in reactions[0]:
-                metadata = reactions[0]['_metadata']
-                total_reddit_scanned = metadata.get('total_scanned', 0)
-                logger.info(f"📊 Reddit scanning stats: {total_reddit_scanned} posts scanned, {len(reactions)} relevant")
-                del reactions[0]['_metadata']
-            
-            for reaction in reactions:
-                await store_reaction(reaction)
-            logger.info(f"Found {len(reactions)} Reddit posts about AI voice")
-        except Exception as e:
-            logger.error(f"Reddit scraping failed: {e}")
-    else:
-        logger.info("Reddit API credentials not configured, skipping Reddit scraping")
+    # News and Reddit don't depend on each other, so collect them concurrently
+    async with create_article_session() as session:
+        (news_items, processed_items), (reactions, total_reddit_scanned) = await asyncio.gather(
+            collect_news(session), collect_reddit()
+        )
     
     # Step 4: Send notifications
     if processed_items or reactions:
@@ -101,6 +117,8 @@ async def run_pipeline(logger):
         if all([os.getenv('SMTP_SERVER'), os.getenv('EMAIL_FROM'), 
                 (os.getenv('EMAIL_TO') or os.getenv('EMAIL_CC') or os.getenv('EMAIL_BCC'))]):
             try:
+                # Notifiers pull in jinja2/langchain/slack_sdk - only import the ones we use
+                from notifiers.email_notifier import send_email_digest
                 await send_email_digest(digest)
                 logger.info("✅ Email sent successfully")
             except Exception as e:
@@ -111,6 +129,7 @@ async def run_pipeline(logger):
         # Slack
         if os.getenv('SLACK_API_TOKEN'):
             try:
+                from notifiers.slack_notifier import send_slack_digest
                 await send_slack_digest(digest)
                 logger.info("✅ Slack sent")
             except Exception as e:
@@ -136,6 +155,14 @@ def main_cli():
     # Set up logging
     logger = setup_logging(args.log_level)
     
+    # Use uvloop's event loop when it's installed (optional)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.debug("Using uvloop event loop")
+    except ImportError:
+        pass
+    
     # Run the main pipeline
     try:
         results = asyncio.run(run_pipeline(logger))
@@ -1,15 +1,18 @@
 """
 Email notifier with GUARANTEED delivery - fixes Gmail CC issues
 """
+import asyncio
+import heapq
 import logging
 import os
 import smtplib
+from collections import Counter, defaultdict
+from functools import lru_cache
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.policy import compat32
 from dotenv import load_dotenv
 import jinja2
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
 from processors.trends_analyzer import analyze_current_trends
 from storage.db_manager import store_run_summary
 import time
@@ -31,6 +34,24 @@ EMAIL_BCC = os.getenv('EMAIL_BCC', '')
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# MIME serialization policy for sendmail: the messages' own compat32 rules (which
+# RFC 2047-encode the emoji subject) but with the CRLF line endings SMTP requires
+SMTP_POLICY = compat32.clone(linesep='\r\n')
+
+# SMTP replies that mean "slow down and try again" (e.g. Gmail rate limiting)
+SMTP_RETRY_CODES = (421, 450, 452)
+
+# Keywords used to rank the top articles (built once, not per scored article)
+HIGH_VALUE_KEYWORDS = (
+    'elevenlabs', 'openai voice', 'breakthrough', 'launch', 'release',
+    'funding', 'acquisition', 'partnership', 'new model', 'api'
+)
+
+MEDIUM_VALUE_KEYWORDS = (
+    'voice ai', 'text-to-speech', 'speech synthesis', 'voice cloning',
+    'ai voice', 'neural voice', 'voice generation'
+)
+
 # Jinja2 template environment
 template_loader = jinja2.FileSystemLoader(searchpath="./templates")
 template_env = jinja2.Environment(loader=template_loader)
@@ -48,14 +69,26 @@ def parse_and_validate_emails(email_string: str) -> list:
     
     return emails
 
-def get_all_recipients():
+@lru_cache(maxsize=8)
+def _parse_recipient_lists(email_to: str, email_cc: str, email_bcc: str) -> tuple:
+    """Parse raw TO/CC/BCC values - cached on the raw strings, so env changes miss the cache"""
+    return (
+        tuple(parse_and_validate_emails(email_to)),
+        tuple(parse_and_validate_emails(email_cc)),
+        tuple(parse_and_validate_emails(email_bcc))
+    )
+
+def get_all_recipients(reload_env: bool = True):
     """Get all email recipients - FIXED to handle Gmail CC issues"""
     # Force reload environment variables
-    load_dotenv(override=True)
+    if reload_env:
+        load_dotenv(override=True)
     
-    to_emails = parse_and_validate_emails(os.getenv('EMAIL_TO', ''))
-    cc_emails = parse_and_validate_emails(os.getenv('EMAIL_CC', ''))
-    bcc_emails = parse_and_validate_emails(os.getenv('EMAIL_BCC', ''))
+    to_emails, cc_emails, bcc_emails = (
+        list(emails) for emails in _parse_recipient_lists(
+            os.getenv('EMAIL_TO', ''), os.getenv('EMAIL_CC', ''), os.getenv('EMAIL_BCC', '')
+        )
+    )
     
     # SOLUTION: Treat ALL emails as TO recipients to avoid Gmail CC issues
     all_recipients = to_emails + cc_emails + bcc_emails
@@ -86,8 +119,8 @@ async def send_email_digest(digest):
         logger.error("❌ Email configuration incomplete")
         return False
     
-    # Get all recipients (treating all as TO to avoid CC issues)
-    all_recipients = get_all_recipients()
+    # Get all recipients (treating all as TO to avoid CC issues) - .env was just reloaded
+    all_recipients = get_all_recipients(reload_env=False)
     
     if not all_recipients:
         logger.error("❌ No valid email recipients found")
@@ -100,103 +133,192 @@ async def send_email_digest(digest):
         enhanced_digest = await build_enhanced_digest(digest)
         html_content = format_digest_for_email(enhanced_digest)
         
-        # Strategy 1: Send to all as TO recipients (avoids Gmail CC issues)
-        success = await send_all_as_to_recipients(
-            smtp_server, smtp_port, smtp_username, smtp_password, email_from,
-            all_recipients, digest['date'], html_content
+        # One SMTP session serves both strategies, so the individual fallback
+        # doesn't pay for another connect/STARTTLS/login handshake
+        session = await asyncio.to_thread(
+            SMTPSession, smtp_server, smtp_port, smtp_username, smtp_password
         )
-        
-        if success:
-            logger.info(f"✅ Email sent successfully to all {len(all_recipients)} recipients!")
-            return True
-        
-        # Strategy 2: If that fails, send individually
-        logger.warning("Bulk send failed, trying individual sends...")
-        success = await send_individually(
-            smtp_server, smtp_port, smtp_username, smtp_password, email_from,
-            all_recipients, digest['date'], html_content
-        )
-        
-        return success
+        try:
+            # Strategy 1: Send to all as TO recipients (avoids Gmail CC issues)
+            undelivered = await send_all_as_to_recipients(
+                session, email_from, all_recipients, digest['date'], html_content
+            )
+            
+            if not undelivered:
+                logger.info(f"✅ Email sent successfully to all {len(all_recipients)} recipients!")
+                return True
+            
+            # Strategy 2: If that fails, send individually to whoever didn't get it
+            logger.warning(f"Bulk send failed for {len(undelivered)} recipients, trying individual sends...")
+            if not await asyncio.to_thread(_smtp_alive, session.server):
+                await asyncio.to_thread(session.reconnect)
+            success = await send_individually(
+                session, email_from, undelivered, digest['date'], html_content
+            )
+            
+            return success
+        finally:
+            await asyncio.to_thread(session.close)
             
     except Exception as e:
         logger.error(f"❌ Email digest failed: {e}")
         return False
 
-async def send_all_as_to_recipients(smtp_server, smtp_port, smtp_username, smtp_password, 
-                                  email_from, all_recipients, date, html_content):
-    """Send to all recipients as TO (avoids Gmail CC delivery issues)"""
+def _connect_smtp(smtp_server, smtp_port, smtp_username, smtp_password):
+    """Open an authenticated SMTP session"""
+    server = smtplib.SMTP(smtp_server, smtp_port)
+    try:
+        server.starttls()
+        server.login(smtp_username, smtp_password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+class SMTPSession:
+    """Authenticated SMTP connection that can be re-opened after the server drops it"""
+    
+    def __init__(self, smtp_server, smtp_port, smtp_username, smtp_password):
+        self.settings = (smtp_server, smtp_port, smtp_username, smtp_password)
+        self.server = _connect_smtp(*self.settings)
+    
+    def reconnect(self):
+        """Replace the current connection with a fresh one"""
+        logger.info("🔄 SMTP session dropped, reconnecting...")
+        _close_smtp(self.server)
+        self.server = _connect_smtp(*self.settings)
+    
+    def ensure_connected(self):
+        """Reconnect if smtplib has closed the socket (it does so itself on a 421 reply)"""
+        if self.server.sock is None:
+            self.reconnect()
+    
+    def close(self):
+        _close_smtp(self.server)
+
+def _smtp_alive(server):
+    """Check whether an SMTP session can still be used"""
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+def _close_smtp(server):
+    """Close an SMTP session, quietly if it already dropped"""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+async def send_all_as_to_recipients(session, email_from, all_recipients, date, html_content):
+    """
+    Send to all recipients as TO (avoids Gmail CC delivery issues)
+    
+    Returns:
+        List of recipients the message could not be delivered to
+    """
     
     logger.info(f"📧 Sending to all {len(all_recipients)} as TO recipients...")
     
+    # smtplib blocks on every SMTP round-trip, so keep it off the event loop
+    return await asyncio.to_thread(
+        _send_all_as_to_recipients_sync, session.server, email_from, all_recipients, date, html_content
+    )
+
+def _send_all_as_to_recipients_sync(server, email_from, all_recipients, date, html_content):
+    """Blocking SMTP part of send_all_as_to_recipients"""
     try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_username, smtp_password)
-            
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"🔊 AI Voice News Digest - {date}"
-            msg['From'] = email_from
-            msg['To'] = ', '.join(all_recipients)  # All as TO recipients
-            
-            msg.attach(MIMEText(html_content, 'html'))
-            
-            # Send to all recipients
-            failed = server.sendmail(email_from, all_recipients, msg.as_string())
-            
-            if not failed:
-                logger.info(f"✅ Successfully sent to all {len(all_recipients)} recipients as TO!")
-                return True
-            else:
-                logger.warning(f"⚠️ Some recipients failed: {failed}")
-                return False
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = f"🔊 AI Voice News Digest - {date}"
+        msg['From'] = email_from
+        msg['To'] = ', '.join(all_recipients)  # All as TO recipients
+        
+        msg.attach(MIMEText(html_content, 'html'))
+        
+        # Send to all recipients - smtplib only fixes line endings for str messages,
+        # so the bytes must already carry CRLFs
+        failed = server.sendmail(email_from, all_recipients, msg.as_bytes(policy=SMTP_POLICY))
+        
+        if not failed:
+            logger.info(f"✅ Successfully sent to all {len(all_recipients)} recipients as TO!")
+            return []
+        else:
+            logger.warning(f"⚠️ Some recipients failed: {failed}")
+            return [email for email in all_recipients if email in failed]
     
     except Exception as e:
         logger.error(f"❌ Bulk TO send failed: {e}")
-        return False
+        return list(all_recipients)
 
-async def send_individually(smtp_server, smtp_port, smtp_username, smtp_password, 
-                          email_from, all_recipients, date, html_content):
+async def send_individually(session, email_from, all_recipients, date, html_content):
     """Send individually to each recipient as fallback"""
     
     logger.info(f"📧 Sending individually to {len(all_recipients)} recipients...")
-    successful_sends = 0
     
-    try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_username, smtp_password)
-            
-            for i, email in enumerate(all_recipients, 1):
-                try:
-                    logger.info(f"  Sending {i}/{len(all_recipients)} to: {email}")
-                    
-                    msg = MIMEMultipart('alternative')
-                    msg['Subject'] = f"🔊 AI Voice News Digest - {date}"
-                    msg['From'] = email_from
-                    msg['To'] = email
-                    msg.attach(MIMEText(html_content, 'html'))
-                    
-                    result = server.sendmail(email_from, [email], msg.as_string())
-                    
-                    if not result:
-                        logger.info(f"    ✅ Success: {email}")
-                        successful_sends += 1
-                    else:
-                        logger.error(f"    ❌ Failed: {email} - {result}")
-                    
-                    time.sleep(0.5)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.error(f"    ❌ Error sending to {email}: {e}")
-    
-    except Exception as e:
-        logger.error(f"❌ Individual send connection failed: {e}")
-        return False
+    successful_sends = await asyncio.to_thread(
+        _send_individually_sync, session, email_from, all_recipients, date, html_content
+    )
     
     logger.info(f"📊 Individual send results: {successful_sends}/{len(all_recipients)} successful")
     return successful_sends == len(all_recipients)
 
+def _send_individually_sync(session, email_from, all_recipients, date, html_content):
+    """Blocking SMTP part of send_individually - returns the number of successful sends"""
+    successful_sends = 0
+    
+    # Build the message once - only the To header changes per recipient,
+    # so the HTML body is encoded a single time
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = f"🔊 AI Voice News Digest - {date}"
+    msg['From'] = email_from
+    msg['To'] = ''
+    msg.attach(MIMEText(html_content, 'html'))
+    
+    for i, email in enumerate(all_recipients, 1):
+        try:
+            logger.info(f"  Sending {i}/{len(all_recipients)} to: {email}")
+            
+            msg.replace_header('To', email)
+            
+            result = _sendmail_with_backoff(session, email_from, [email], msg.as_bytes(policy=SMTP_POLICY))
+            
+            if not result:
+                logger.info(f"    ✅ Success: {email}")
+                successful_sends += 1
+            else:
+                logger.error(f"    ❌ Failed: {email} - {result}")
+            
+        except Exception as e:
+            logger.error(f"    ❌ Error sending to {email}: {e}")
+    
+    return successful_sends
+
+def _sendmail_with_backoff(session, email_from, recipients, message, retries=3, delay=1.0):
+    """Send right away and only back off when the server asks us to slow down"""
+    for attempt in range(retries + 1):
+        # A 421 on an earlier recipient may have left the connection closed
+        session.ensure_connected()
+        try:
+            return session.server.sendmail(email_from, recipients, message)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+            code = _smtp_retry_code(e)
+            if code is None or attempt == retries:
+                raise
+            logger.warning(f"    ⏳ Server replied {code}, retrying in {delay:.0f}s")
+            time.sleep(delay)
+            delay *= 2
+            if code == 421:
+                # smtplib has already closed the connection behind a 421
+                session.reconnect()
+
+def _smtp_retry_code(error):
+    """The "try again later" reply code behind an SMTP error, or None if it shouldn't be retried"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # Throttled RCPTs (Gmail's usual 450/452) arrive per recipient, not as a response exception
+        codes = {code for code, _ in error.recipients.values()}
+        return codes.pop() if len(codes) == 1 and codes <= set(SMTP_RETRY_CODES) else None
+    return error.smtp_code if error.smtp_code in SMTP_RETRY_CODES else None
+
 # Copy all the other functions from the previous version
 async def build_enhanced_digest(digest):
     """Build enhanced digest with all features"""
@@ -213,16 +335,19 @@ async def build_enhanced_digest(digest):
             'subreddit_activity': subreddit_activity
         }
         
-        # Analyze trends
-        trends_data = await analyze_current_trends(current_run_data)
-        await store_run_summary(current_run_data)
-        
-        # Generate executive summary
-        executive_summary = await generate_executive_summary(
-            digest['news_items'], 
-            digest.get('reactions', [])
+        # Analyze trends and generate the executive summary together - the LLM round-trip
+        # dominates, so the trends pass is hidden behind it
+        trends_data, executive_summary = await asyncio.gather(
+            analyze_current_trends(current_run_data),
+            generate_executive_summary(
+                digest['news_items'], 
+                digest.get('reactions', [])
+            )
         )
         
+        # Store this run only after trends have read the previous ones
+        await store_run_summary(current_run_data)
+        
         # Select top articles
         top_articles = select_top_articles(digest['news_items'], limit=5)
         
@@ -246,6 +371,9 @@ async def generate_executive_summary(news_items, reactions):
         return "Executive summary not available (OpenAI API key not configured)"
     
     try:
+        from langchain_openai import ChatOpenAI
+        from langchain_core.prompts import PromptTemplate
+        
         news_content = []
         for item in news_items[:10]:
             news_content.append(f"• {item['title']} ({item['source']}): {item.get('summary', '')[:200]}")
@@ -285,7 +413,7 @@ async def generate_executive_summary(news_items, reactions):
             reddit_content="\n".join(reddit_content) if reddit_content else "No community discussions found"
         )
         
-        summary = llm.invoke(formatted_prompt)
+        summary = await llm.ainvoke(formatted_prompt)
         return summary.content.strip()
         
     except Exception as e:
@@ -302,21 +430,11 @@ def select_top_articles(news_items, limit=5):
         title_lower = item.get('title', '').lower()
         summary_lower = item.get('summary', '').lower()
         
-        high_value_keywords = [
-            'elevenlabs', 'openai voice', 'breakthrough', 'launch', 'release',
-            'funding', 'acquisition', 'partnership', 'new model', 'api'
-        ]
-        
-        for keyword in high_value_keywords:
+        for keyword in HIGH_VALUE_KEYWORDS:
             if keyword in title_lower or keyword in summary_lower:
                 score += 10
         
-        medium_value_keywords = [
-            'voice ai', 'text-to-speech', 'speech synthesis', 'voice cloning',
-            'ai voice', 'neural voice', 'voice generation'
-        ]
-        
-        for keyword in medium_value_keywords:
+        for keyword in MEDIUM_VALUE_KEYWORDS:
             if keyword in title_lower:
                 score += 5
             elif keyword in summary_lower:
@@ -327,20 +445,15 @@ def select_top_articles(news_items, limit=5):
         
         return score
     
-    sorted_items = sorted(news_items, key=relevance_score, reverse=True)
-    return sorted_items[:limit]
+    # Only the top few are needed, so don't sort everything
+    return heapq.nlargest(limit, news_items, key=relevance_score)
 
 def calculate_sentiment_summary(reactions):
     """Calculate sentiment summary"""
+    # Counter tallies in C; keep the three sentiment keys even when a count is zero
     sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
-    subreddit_activity = {}
-    
-    for reaction in reactions:
-        sentiment = reaction.get('sentiment', 'neutral')
-        sentiment_counts[sentiment] += 1
-        
-        subreddit = reaction.get('subreddit', 'unknown')
-        subreddit_activity[subreddit] = subreddit_activity.get(subreddit, 0) + 1
+    sentiment_counts.update(Counter(reaction.get('sentiment', 'neutral') for reaction in reactions))
+    subreddit_activity = dict(Counter(reaction.get('subreddit', 'unknown') for reaction in reactions))
     
     return sentiment_counts, subreddit_activity
 
@@ -349,19 +462,16 @@ def format_digest_for_email(digest):
     try:
         template = template_env.get_template('email_digest.html')
         
-        reactions_by_platform = {}
+        reactions_by_platform = defaultdict(list)
         for reaction in digest.get('reactions', []):
-            platform = reaction['platform']
-            if platform not in reactions_by_platform:
-                reactions_by_platform[platform] = []
-            reactions_by_platform[platform].append(reaction)
+            reactions_by_platform[reaction['platform']].append(reaction)
         
         return template.render(
             date=digest['date'],
             news_items=digest.get('news_items', []),
             top_articles=digest.get('top_articles', []),
             reactions=digest.get('reactions', []),
-            reactions_by_platform=reactions_by_platform,
+            reactions_by_platform=dict(reactions_by_platform),  # plain dict so missing keys stay undefined in the template
             executive_summary=digest.get('executive_summary', ''),
             total_articles_found=digest.get('total_articles_found', 0),
             total_reddit_posts=digest.get('total_reddit_posts', 0),
@@ -4,6 +4,7 @@ Slack notifier for AI Voice News Scraper
 import logging
 import os
 import json
+from collections import defaultdict
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from dotenv import load_dotenv
@@ -102,12 +103,9 @@ def format_digest_for_slack(digest):
         })
         
         # Group reactions by platform
-        platforms = {}
+        platforms = defaultdict(list)
         for reaction in digest['reactions']:
-            platform = reaction['platform']
-            if platform not in platforms:
-                platforms[platform] = []
-            platforms[platform].append(reaction)
+            platforms[reaction['platform']].append(reaction)
         
         # Add each platform's reactions
         for platform, reactions in platforms.items():
@@ -8,8 +8,8 @@ import aiohttp
 from bs4 import BeautifulSoup
 import os
 from dotenv import load_dotenv
-import ssl
-import certifi
+from functools import lru_cache
+from scrapers.news_scraper import HTML_PARSER, VERIFIED_SSL_CONTEXT, read_capped, ssl_context_for
 
 # Fix the import path
 try:
@@ -52,63 +52,105 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 # Replace the existing VOICE_AI_KEYWORDS with:
 VOICE_AI_KEYWORDS = ALL_VOICE_AI_KEYWORDS
 
-async def fetch_article_content(url):
-    """Fetch the full content of an article"""
+# One alternation scans the text once instead of a substring test per keyword
+# (longest first so the most specific keyword wins at a given position)
+VOICE_AI_KEYWORD_RE = re.compile(
+    '|'.join(map(re.escape, sorted(VOICE_AI_KEYWORDS, key=len, reverse=True))),
+    re.IGNORECASE
+)
+
+# Fallback "AI + voice" check - case-insensitive so the article is never lowercased/copied
+AI_TERM_RE = re.compile(r'ai|artificial intelligence', re.IGNORECASE)
+VOICE_TERM_RE = re.compile(r'voice|speech|audio', re.IGNORECASE)
+
+# Article text lives well inside the first couple of MB - don't download/decode the rest
+MAX_ARTICLE_BYTES = 2 * 1024 * 1024
+
+# Publishers that rate limit us get a few backed-off retries instead of a dropped article
+RETRY_STATUSES = (429, 503)
+MAX_RETRY_WAIT = 30
+
+def create_article_session():
+    """Create a session for article fetches - pooled keep-alive connections, bounded per host, cached DNS"""
+    connector = aiohttp.TCPConnector(
+        ssl=VERIFIED_SSL_CONTEXT,
+        limit=20,
+        limit_per_host=2,
+        ttl_dns_cache=300
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+async def fetch_article_content(url, session=None):
+    """Fetch the full content of an article (over the shared session when one is given)"""
     try:
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_OPTIONAL
-        
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(url, timeout=10) as response:
-                if response.status != 200:
-                    logger.error(f"Error fetching article: {response.status}")
-                    return None
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.extract()
-                
-                # Get text
-                text = soup.get_text()
-                
-                # Break into lines and remove leading and trailing space
-                lines = (line.strip() for line in text.splitlines())
-                # Break multi-headlines into a line each
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                # Remove blank lines
-                text = '\n'.join(chunk for chunk in chunks if chunk)
-                
-                return text
+        if session is None:
+            async with create_article_session() as own_session:
+                return await _fetch_article_text(own_session, url)
+        return await _fetch_article_text(session, url)
     except Exception as e:
         logger.error(f"Error fetching article content: {str(e)}")
         return None
 
+async def _fetch_article_text(session, url, retries=3, delay=1.0):
+    """Download an article and reduce it to plain text"""
+    for attempt in range(retries + 1):
+        async with session.get(url, timeout=10, ssl=ssl_context_for(url)) as response:
+            if response.status in RETRY_STATUSES and attempt < retries:
+                wait = _retry_after_seconds(response.headers.get('Retry-After'), delay)
+            elif response.status != 200:
+                logger.error(f"Error fetching article: {response.status}")
+                return None
+            else:
+                raw = await read_capped(response, MAX_ARTICLE_BYTES)
+                charset = response.charset
+                break
+        
+        # Back off outside the response block so the connection goes back to the pool
+        logger.warning(f"⏳ {url} returned {response.status}, retrying in {wait:.0f}s")
+        await asyncio.sleep(wait)
+        delay *= 2
+    
+    # Hand over bytes so BeautifulSoup can sniff <meta charset> when the header has none
+    soup = BeautifulSoup(raw, HTML_PARSER, from_encoding=charset)
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.extract()
+    
+    # Get text
+    text = soup.get_text()
+    
+    # Break into lines and remove leading and trailing space
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Remove blank lines
+    text = '\n'.join(chunk for chunk in chunks if chunk)
+    
+    return text
+
+def _retry_after_seconds(retry_after, default):
+    """Honour a numeric Retry-After header (capped), otherwise use our own backoff"""
+    try:
+        return min(float(retry_after), MAX_RETRY_WAIT)
+    except (TypeError, ValueError):
+        return default
+
 def is_relevant_to_voice_ai(text):
     """Check if the content is relevant to voice AI with LENIENT logic"""
     if not text:
         return False
         
-    text_lower = text.lower()
-    
-    # Check for ANY voice AI keyword matches (more lenient)
-    keyword_matches = sum(1 for keyword in VOICE_AI_KEYWORDS if keyword in text_lower)
+    # Check for ANY voice AI keyword match (more lenient) - stop at the first one
+    match = VOICE_AI_KEYWORD_RE.search(text)
     
     # If we have any voice AI keywords, it's relevant
-    if keyword_matches > 0:
-        logger.info(f"Found {keyword_matches} voice AI keywords - marking as relevant")
+    if match:
+        logger.info(f"Found voice AI keyword '{match.group(0).lower()}' - marking as relevant")
         return True
     
     # Also check for AI + voice combinations
-    has_ai = any(word in text_lower for word in ['ai', 'artificial intelligence'])
-    has_voice = any(word in text_lower for word in ['voice', 'speech', 'audio'])
-    
-    if has_ai and has_voice:
+    if AI_TERM_RE.search(text) and VOICE_TERM_RE.search(text):
         logger.info("Found AI + voice combination - marking as relevant")
         return True
     
@@ -116,11 +158,20 @@ def is_relevant_to_voice_ai(text):
 
 async def summarize_content(content, title):
     """Summarize the article content - simplified version"""
+    summary, _ = await _summarize(content, title)
+    return summary
+
+def _simple_summary(content):
+    """First three sentences - used when the LLM isn't available"""
+    sentences = content.split('.')[:3]
+    return '. '.join(sentences) + '.'
+
+async def _summarize(content, title):
+    """Summarize the article content, returning the summary and its source ('llm' or 'simple')"""
     if not OPENAI_API_KEY:
         logger.warning("OpenAI API key not configured - using simple summary")
         # Simple fallback summary
-        sentences = content.split('.')[:3]
-        return '. '.join(sentences) + '.'
+        return _simple_summary(content), 'simple'
     
     try:
         # Try to use OpenAI for summarization
@@ -173,16 +224,25 @@ async def summarize_content(content, title):
             prompt=prompt
         )
         
-        # Run the chain
-        summary = chain.run({"input_documents": docs, "title": title})
-        return summary.strip()
+        # Run the chain asynchronously - a blocking call here would stall the other in-flight article fetches
+        result = await chain.ainvoke({"input_documents": docs, "title": title})
+        return result["output_text"].strip(), 'llm'
     except Exception as e:
         logger.error(f"Error summarizing content: {str(e)}")
         # Fallback to simple summary
-        sentences = content.split('.')[:3]
-        return '. '.join(sentences) + '.'
+        return _simple_summary(content), 'simple'
 
-async def process_content(news_item):
+@lru_cache(maxsize=1)
+def _stored_articles():
+    """Articles the LLM summarized in earlier runs, keyed by URL (loaded once per process)"""
+    from storage.db_manager import load_file_data
+    # Fallback summaries (no key / LLM error) aren't reused, so they get another chance
+    return {
+        item['url']: item for item in load_file_data('news_items')
+        if item.get('url') and item.get('summary') and item.get('summary_source') == 'llm'
+    }
+
+async def process_content(news_item, session=None):
     """Process a news item: fetch content, check relevance, summarize"""
     logger.info(f"Processing: {news_item['title']}")
     
@@ -190,16 +250,26 @@ async def process_content(news_item):
     if is_relevant_to_voice_ai(news_item['title']):
         logger.info(f"Title is relevant to voice AI: {news_item['title']}")
         
+        # Already summarized in an earlier run - skip the fetch and the LLM call
+        stored = _stored_articles().get(news_item['url'])
+        if stored:
+            logger.info(f"Reusing stored summary: {news_item['title']}")
+            news_item['content'] = stored.get('content', '')
+            news_item['summary'] = stored['summary']
+            news_item['summary_source'] = stored['summary_source']
+            return news_item
+        
         # Try to fetch the full article content
-        content = await fetch_article_content(news_item['url'])
+        content = await fetch_article_content(news_item['url'], session=session)
         if content:
             news_item['content'] = content
             
             # Double-check with full content
             if is_relevant_to_voice_ai(content):
                 # Summarize the content
-                summary = await summarize_content(content, news_item['title'])
+                summary, source = await _summarize(content, news_item['title'])
                 news_item['summary'] = summary
+                news_item['summary_source'] = source
                 
                 logger.info(f"Processed article: {news_item['title']}")
                 return news_item
@@ -210,6 +280,7 @@ async def process_content(news_item):
             logger.warning(f"Could not fetch content but title is relevant: {news_item['title']}")
             news_item['content'] = news_item.get('content', '')
             news_item['summary'] = f"Summary not available. Title: {news_item['title']}"
+            news_item['summary_source'] = 'unavailable'
             return news_item
     
     logger.info(f"Article not relevant to voice AI: {news_item['title']}")
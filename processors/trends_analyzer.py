@@ -2,13 +2,21 @@
 Trends analyzer for AI Voice News Scraper
 Analyzes sentiment trends over the last few runs
 """
+import heapq
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from storage.db_manager import get_recent_runs
 
 logger = logging.getLogger(__name__)
 
+TREND_EMOJIS = {
+    "improving": "📈",
+    "declining": "📉",
+    "stable": "➡️"
+}
+
 class TrendsAnalyzer:
     """Analyzes trends in sentiment and activity over recent runs"""
     
@@ -49,12 +57,7 @@ class TrendsAnalyzer:
     
     def _get_trend_emoji(self, direction: str) -> str:
         """Get emoji for trend direction"""
-        emoji_map = {
-            "improving": "📈",
-            "declining": "📉", 
-            "stable": "➡️"
-        }
-        return emoji_map.get(direction, "➡️")
+        return TREND_EMOJIS.get(direction, "➡️")
     
     async def analyze_trends(self, current_run_data: Dict) -> Dict:
         """Analyze trends over the last 3 runs including current"""
@@ -62,10 +65,11 @@ class TrendsAnalyzer:
             # Get the last 2 runs (we'll add current as the 3rd)
             recent_runs = await get_recent_runs(limit=2)
             
-            # Add current run data
+            # Add current run data (one clock read so timestamp and date agree)
+            now = datetime.now()
             current_summary = {
-                'timestamp': datetime.now().isoformat(),
-                'date': datetime.now().strftime('%Y-%m-%d'),
+                'timestamp': now.isoformat(),
+                'date': now.strftime('%Y-%m-%d'),
                 'articles_found': current_run_data.get('articles_found', 0),
                 'articles_processed': current_run_data.get('articles_processed', 0),
                 'reddit_posts': current_run_data.get('reddit_posts', 0),
@@ -161,13 +165,11 @@ class TrendsAnalyzer:
     
     def _analyze_subreddit_trends(self, runs: List[Dict]) -> Dict:
         """Analyze which subreddits are most/least active"""
-        subreddit_activity = {}
+        subreddit_activity = defaultdict(list)
         
         for run in runs:
             activity = run.get('subreddit_activity', {})
             for subreddit, count in activity.items():
-                if subreddit not in subreddit_activity:
-                    subreddit_activity[subreddit] = []
                 subreddit_activity[subreddit].append(count)
         
         # Calculate trends for each subreddit
@@ -183,11 +185,10 @@ class TrendsAnalyzer:
                     'current_posts': counts[0] if counts else 0
                 }
         
-        # Sort by average activity
-        sorted_subreddits = sorted(subreddit_trends.items(), 
-                                 key=lambda x: x[1]['avg_posts'], reverse=True)
+        # Top 5 most active by average activity - no need to sort the rest
+        top_subreddits = heapq.nlargest(5, subreddit_trends.items(), key=lambda x: x[1]['avg_posts'])
         
-        return dict(sorted_subreddits[:5])  # Top 5 most active
+        return dict(top_subreddits)
     
     def _generate_insights(self, sentiment_trend: str, activity_trend: str, news_trend: str,
                           sentiment_change: float, activity_change: float, news_change: float) -> List[str]:
@@ -9,10 +9,34 @@ from bs4 import BeautifulSoup
 import feedparser
 import ssl
 import certifi
-import urllib3
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# lxml's C parser is much faster than the pure-Python html.parser - use it when installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+RSS_USER_AGENT = "AI Voice News Scraper 1.0"
+
+# Index pages carry their headline links early - cap what we download and parse
+MAX_PAGE_BYTES = 512 * 1024
+
+async def read_capped(response, limit, chunk_size=64 * 1024):
+    """Read a response body up to `limit` bytes (StreamReader.read(n) only returns what's buffered so far)"""
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(chunk_size):
+        body += chunk
+        if len(body) >= limit:
+            # End on a tag boundary so a multi-byte character isn't cut in half -
+            # a torn character would make encoding detection reject the real charset
+            end = body.rfind(b'>', 0, limit)
+            return bytes(body[:end + 1] if end != -1 else body[:limit])
+    return bytes(body)
+
 def create_ssl_context():
     """Create a more permissive SSL context for problematic sites"""
     # Create SSL context with certifi for most sites
@@ -24,6 +48,19 @@ def create_ssl_context():
     
     return context
 
+# Shared sessions verify certificates and hostnames; only the hosts listed here, whose
+# certificates are known not to verify, fall back to the permissive context per request
+VERIFIED_SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+PERMISSIVE_SSL_CONTEXT = create_ssl_context()
+PERMISSIVE_SSL_HOSTS = ('googleblog.com',)
+
+def ssl_context_for(url):
+    """SSL context to use for a request to `url`"""
+    host = urlparse(url).hostname or ''
+    if any(host == name or host.endswith('.' + name) for name in PERMISSIVE_SSL_HOSTS):
+        return PERMISSIVE_SSL_CONTEXT
+    return VERIFIED_SSL_CONTEXT
+
 # Clean news sources without duplicates - WORKING SOURCES
 NEWS_SOURCES = [
     # RSS feeds (more reliable than web scraping)
@@ -77,16 +114,14 @@ NEWS_SOURCES = [
 async def scrape_web_source(session, source):
     """Scrape a web-based news source with SSL handling"""
     try:
-        # Create SSL context
-        ssl_context = create_ssl_context()
-        
-        async with session.get(source['url'], timeout=10, ssl=ssl_context) as response:
+        async with session.get(source['url'], timeout=10, ssl=ssl_context_for(source['url'])) as response:
             if response.status != 200:
                 logger.error(f"Error fetching {source['name']}: {response.status}")
                 return []
             
-            html = await response.text()
-            soup = BeautifulSoup(html, 'html.parser')
+            raw = await read_capped(response, MAX_PAGE_BYTES)
+            # Hand over bytes so BeautifulSoup can sniff <meta charset> when the header has none
+            soup = BeautifulSoup(raw, HTML_PARSER, from_encoding=response.charset)
             
             articles = []
             elements = soup.select(source['selector'])
@@ -120,20 +155,24 @@ async def scrape_web_source(session, source):
         logger.error(f"Error scraping {source['name']}: {str(e)}")
         return []
 
-async def scrape_rss_source(source):
+async def scrape_rss_source(session, source):
     """Scrape an RSS feed source with better error handling"""
     try:
-        # Set user agent for feedparser
-        feedparser.USER_AGENT = "AI Voice News Scraper 1.0"
-        
-        # Disable SSL verification warnings
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        # Download over the shared session (pooled, non-blocking), then let feedparser parse the bytes
+        async with session.get(
+            source['url'], timeout=10, headers={'User-Agent': RSS_USER_AGENT}, ssl=ssl_context_for(source['url'])
+        ) as response:
+            if response.status != 200:
+                logger.error(f"Error fetching RSS {source['name']}: {response.status}")
+                return []
+            
+            raw = await response.read()
+            response_headers = {
+                'content-location': str(response.url),
+                'content-type': response.headers.get('Content-Type', '')
+            }
         
-        # Use a more permissive approach for problematic domains
-        if 'googleblog.com' in source['url']:
-            feed = feedparser.parse(source['url'], ssl_verify=False)
-        else:
-            feed = feedparser.parse(source['url'])
+        feed = feedparser.parse(raw, response_headers=response_headers)
         
         if not feed.entries:
             logger.warning(f"No entries found in RSS feed: {source['name']}")
@@ -159,15 +198,20 @@ async def scrape_rss_source(source):
         logger.error(f"Error scraping RSS {source['name']}: {str(e)}")
         return []
 
-async def scrape_news_sources():
-    """Scrape all configured news sources"""
+async def scrape_news_sources(session=None):
+    """Scrape all configured news sources (over the caller's session when one is given)"""
+    if session is None:
+        connector = aiohttp.TCPConnector(ssl=VERIFIED_SSL_CONTEXT)
+        async with aiohttp.ClientSession(connector=connector) as own_session:
+            return await scrape_news_sources(own_session)
+    
     all_articles = []
     
     # Process RSS sources first (more reliable)
     rss_tasks = []
     for source in NEWS_SOURCES:
         if source['type'] == 'rss':
-            rss_tasks.append(scrape_rss_source(source))
+            rss_tasks.append(scrape_rss_source(session, source))
     
     if rss_tasks:
         logger.info(f"Processing {len(rss_tasks)} RSS sources...")
@@ -179,22 +223,19 @@ async def scrape_news_sources():
                 logger.error(f"RSS task failed: {result}")
     
     # Process web sources
-    ssl_context = create_ssl_context()
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        web_tasks = []
-        for source in NEWS_SOURCES:
-            if source['type'] == 'web':
-                web_tasks.append(scrape_web_source(session, source))
-        
-        if web_tasks:
-            logger.info(f"Processing {len(web_tasks)} web sources...")
-            web_results = await asyncio.gather(*web_tasks, return_exceptions=True)
-            for result in web_results:
-                if isinstance(result, list):
-                    all_articles.extend(result)
-                else:
-                    logger.error(f"Web task failed: {result}")
+    web_tasks = []
+    for source in NEWS_SOURCES:
+        if source['type'] == 'web':
+            web_tasks.append(scrape_web_source(session, source))
+    
+    if web_tasks:
+        logger.info(f"Processing {len(web_tasks)} web sources...")
+        web_results = await asyncio.gather(*web_tasks, return_exceptions=True)
+        for result in web_results:
+            if isinstance(result, list):
+                all_articles.extend(result)
+            else:
+                logger.error(f"Web task failed: {result}")
     
     # Remove duplicates based on URL
     seen_urls = set()
@@ -2,13 +2,18 @@
 Reddit scraper for AI Voice News Scraper - Enhanced for better post inclusion
 """
 import asyncio
+import heapq
 import logging
 import os
+import re
 import ssl
 import certifi
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
 
 # Load environment variables
 load_dotenv()
@@ -42,6 +47,22 @@ VOICE_AI_KEYWORDS = [
     'voice api', 'voice sdk', 'voice platform'
 ]
 
+# Single-pass pre-filter: most posts match no keyword at all, so one regex scan
+# lets us skip the per-keyword loop for them
+VOICE_AI_KEYWORD_RE = re.compile('|'.join(map(re.escape, VOICE_AI_KEYWORDS)))
+
+# (primary, secondaries) pairs for flexible relevance matching; '' means primary alone is enough
+FLEXIBLE_PATTERNS = (
+    ('voice', ('ai', 'artificial intelligence', 'machine learning', 'neural')),
+    ('speech', ('synthesis', 'generation', 'ai', 'artificial')),
+    ('audio', ('generation', 'synthesis', 'ai', 'neural')),
+    ('text to speech', ('', 'tts')),
+    ('ai', ('voice', 'speech', 'audio generation'))
+)
+
+# Title keywords that earn a post the high-value ranking bonus
+HIGH_VALUE_KEYWORDS = ('elevenlabs', 'openai voice', 'breakthrough', 'release', 'announcement')
+
 # Target subreddits - expanded for better coverage
 TARGET_SUBREDDITS = [
     'MachineLearning', 'artificial', 'OpenAI', 'technology',
@@ -49,29 +70,32 @@ TARGET_SUBREDDITS = [
     'artificial_intelligence', 'deeplearning', 'compsci'
 ]
 
+# Sentiment word lists, built once rather than on every call
+POSITIVE_WORDS = (
+    'amazing', 'awesome', 'great', 'excellent', 'fantastic', 'incredible',
+    'breakthrough', 'impressive', 'revolutionary', 'game-changing',
+    'love', 'perfect', 'brilliant', 'outstanding', 'wonderful', 'excited',
+    'innovative', 'remarkable', 'stunning', 'phenomenal', 'mind-blowing'
+)
+
+NEGATIVE_WORDS = (
+    'terrible', 'awful', 'bad', 'horrible', 'disappointing', 'useless',
+    'broken', 'failed', 'worst', 'hate', 'sucks', 'garbage',
+    'concerning', 'worried', 'dangerous', 'scary', 'creepy',
+    'disturbing', 'problematic', 'flawed', 'buggy'
+)
+
 def simple_sentiment_analysis(text: str) -> tuple[str, str]:
     """Enhanced sentiment analysis"""
     if not text:
         return 'neutral', '😐'
     
-    text_lower = text.lower()
-    
-    positive_words = [
-        'amazing', 'awesome', 'great', 'excellent', 'fantastic', 'incredible',
-        'breakthrough', 'impressive', 'revolutionary', 'game-changing',
-        'love', 'perfect', 'brilliant', 'outstanding', 'wonderful', 'excited',
-        'innovative', 'remarkable', 'stunning', 'phenomenal', 'mind-blowing'
-    ]
-    
-    negative_words = [
-        'terrible', 'awful', 'bad', 'horrible', 'disappointing', 'useless',
-        'broken', 'failed', 'worst', 'hate', 'sucks', 'garbage',
-        'concerning', 'worried', 'dangerous', 'scary', 'creepy',
-        'disturbing', 'problematic', 'flawed', 'buggy'
-    ]
-    
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
+    return _sentiment_from_lower(text.lower())
+
+def _sentiment_from_lower(text_lower: str) -> tuple[str, str]:
+    """Sentiment for text that is already lowercased"""
+    positive_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+    negative_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
     
     # Weight positive emotions more heavily for tech discussions
     if positive_count > negative_count + 1:
@@ -90,7 +114,6 @@ def simple_summarize(text: str, max_length: int = 180) -> str:
     text = text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
     
     # Remove multiple spaces
-    import re
     text = re.sub(r'\s+', ' ', text).strip()
     
     # If text is short enough, return as is
@@ -125,25 +148,16 @@ def simple_summarize(text: str, max_length: int = 180) -> str:
     
     return summary.strip() or text[:max_length] + "..."
 
-def fix_ssl_for_reddit():
-    """Fix SSL issues for Reddit"""
-    try:
-        import ssl
-        import certifi
-        import urllib3
-        
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        ssl._create_default_https_context = lambda: ssl_context
-        
-        return True
-    except Exception as e:
-        logger.warning(f"Could not fix SSL: {e}")
-        return False
+# One verified TLS context for the whole process - pooled connections share it,
+# so later handshakes can resume the TLS session instead of starting over
+REDDIT_SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+
+class TLSAdapter(HTTPAdapter):
+    """HTTPAdapter that uses the shared certifi-backed SSL context"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = REDDIT_SSL_CONTEXT
+        return super().init_poolmanager(*args, **kwargs)
 
 class EnhancedRedditScraper:
     """Enhanced Reddit scraper for better post inclusion"""
@@ -159,13 +173,10 @@ class EnhancedRedditScraper:
             return False
         
         try:
-            fix_ssl_for_reddit()
-            
             import praw
-            import requests
             
             session = requests.Session()
-            session.verify = False
+            session.mount('https://', TLSAdapter())
             
             self.reddit = praw.Reddit(
                 client_id=REDDIT_CLIENT_ID,
@@ -178,7 +189,7 @@ class EnhancedRedditScraper:
             # Test connection with a simple request
             try:
                 test_sub = self.reddit.subreddit('test')
-                list(test_sub.hot(limit=1))
+                next(iter(test_sub.hot(limit=1)), None)  # pull one post, don't materialize a list
                 logger.info("✅ Reddit connection successful")
                 return True
             except Exception as e:
@@ -192,29 +203,19 @@ class EnhancedRedditScraper:
             logger.error(f"❌ Reddit initialization failed: {str(e)}")
             return False
     
-    def _is_voice_ai_related(self, text: str) -> tuple[bool, List[str]]:
-        """Enhanced relevance checking with more flexible matching"""
-        if not text:
+    def _is_voice_ai_related(self, text_lower: str) -> tuple[bool, List[str]]:
+        """Enhanced relevance checking with more flexible matching (expects lowercased text)"""
+        if not text_lower:
             return False, []
         
-        text_lower = text.lower()
         matched_keywords = []
         
-        # Direct keyword matching
-        for keyword in VOICE_AI_KEYWORDS:
-            if keyword in text_lower:
-                matched_keywords.append(keyword)
+        # Direct keyword matching - only walk the list when something matched
+        if VOICE_AI_KEYWORD_RE.search(text_lower):
+            matched_keywords = [keyword for keyword in VOICE_AI_KEYWORDS if keyword in text_lower]
         
         # Flexible pattern matching
-        flexible_patterns = [
-            ('voice', ['ai', 'artificial intelligence', 'machine learning', 'neural']),
-            ('speech', ['synthesis', 'generation', 'ai', 'artificial']),
-            ('audio', ['generation', 'synthesis', 'ai', 'neural']),
-            ('text to speech', ['', 'tts']),
-            ('ai', ['voice', 'speech', 'audio generation'])
-        ]
-        
-        for primary, secondary_list in flexible_patterns:
+        for primary, secondary_list in FLEXIBLE_PATTERNS:
             if primary in text_lower:
                 for secondary in secondary_list:
                     if not secondary or secondary in text_lower:
@@ -236,9 +237,8 @@ class EnhancedRedditScraper:
         score += len(keywords) * 15
         
         # High-value keyword bonus
-        high_value = ['elevenlabs', 'openai voice', 'breakthrough', 'release', 'announcement']
         title_lower = post_data.get('title', '').lower()
-        for hv_keyword in high_value:
+        for hv_keyword in HIGH_VALUE_KEYWORDS:
             if hv_keyword in title_lower:
                 score += 30
         
@@ -256,6 +256,94 @@ class EnhancedRedditScraper:
         
         return score
     
+    def _scan_subreddit(self, subreddit_name: str) -> tuple[List[Dict], int]:
+        """
+        Scan a single subreddit for voice AI posts (blocking PRAW calls)
+        
+        Returns:
+            Tuple of (relevant_posts, posts_checked)
+        """
+        posts = []
+        posts_checked = 0
+        seen_ids = set()  # hot and new overlap - each post is only checked once
+        
+        try:
+            subreddit = self.reddit.subreddit(subreddit_name)
+            
+            # Check more posts with multiple sorting methods
+            post_sources = [
+                ('hot', subreddit.hot(limit=30)),
+                ('new', subreddit.new(limit=20)),
+            ]
+            
+            for source_name, source_posts in post_sources:
+                try:
+                    for post in source_posts:
+                        if post.id in seen_ids:
+                            continue
+                        seen_ids.add(post.id)
+                        posts_checked += 1
+                        
+                        try:
+                            title = post.title or ""
+                            selftext = getattr(post, 'selftext', '') or ""
+                            combined_text = f"{title} {selftext}"
+                            combined_lower = combined_text.lower()  # once per post, shared by both checks
+                            
+                            is_relevant, matched_keywords = self._is_voice_ai_related(combined_lower)
+                            
+                            if is_relevant:
+                                sentiment, sentiment_emoji = _sentiment_from_lower(combined_lower)
+                                summary = simple_summarize(combined_text)
+                                
+                                external_url = None
+                                if hasattr(post, 'url') and post.url:
+                                    if not post.url.startswith('https://www.reddit.com'):
+                                        external_url = post.url
+                                
+                                post_data = {
+                                    'platform': 'reddit',
+                                    'subreddit': subreddit_name,
+                                    'title': title,
+                                    'content': selftext[:300] if selftext else "",
+                                    'url': f"https://reddit.com{post.permalink}",
+                                    'author': str(post.author) if post.author else '[deleted]',
+                                    'score': getattr(post, 'score', 0),
+                                    'num_comments': getattr(post, 'num_comments', 0),
+                                    'created_utc': getattr(post, 'created_utc', 0),
+                                    'created_date': datetime.fromtimestamp(getattr(post, 'created_utc', 0)).strftime('%Y-%m-%d %H:%M'),
+                                    'sentiment': sentiment,
+                                    'sentiment_emoji': sentiment_emoji,
+                                    'summary': summary,
+                                    'matched_keywords': matched_keywords,
+                                    'external_url': external_url
+                                }
+                                
+                                # Calculate relevance score
+                                post_data['relevance_score'] = self._calculate_post_score(post_data)
+                                
+                                posts.append(post_data)
+                                logger.info(f"📝 Found: {title[:60]}... (score: {post_data['relevance_score']})")
+                                
+                                # Allow up to 4 posts per subreddit per source
+                                if len(posts) >= 4:
+                                    break
+                        
+                        except Exception as post_error:
+                            logger.warning(f"Error processing post: {post_error}")
+                            continue
+                
+                except Exception as source_error:
+                    logger.warning(f"Error with {source_name} posts in r/{subreddit_name}: {source_error}")
+                    continue
+            
+            logger.info(f"✅ r/{subreddit_name}: checked {posts_checked}, found {len(posts)}")
+        
+        except Exception as subreddit_error:
+            logger.warning(f"Error accessing r/{subreddit_name}: {subreddit_error}")
+        
+        return posts, posts_checked
+    
     async def scrape_reddit(self, news_items: Optional[List] = None) -> List[Dict]:
         """Enhanced Reddit scraping with better post inclusion"""
         if not self.reddit:
@@ -272,81 +360,11 @@ class EnhancedRedditScraper:
             try:
                 logger.info(f"🔍 Scanning r/{subreddit_name}...")
                 
-                try:
-                    subreddit = self.reddit.subreddit(subreddit_name)
-                    posts_checked = 0
-                    posts_found = 0
-                    
-                    # Check more posts with multiple sorting methods
-                    post_sources = [
-                        ('hot', subreddit.hot(limit=30)),
-                        ('new', subreddit.new(limit=20)),
-                    ]
-                    
-                    for source_name, source_posts in post_sources:
-                        try:
-                            for post in source_posts:
-                                posts_checked += 1
-                                total_posts_checked += 1
-                                
-                                try:
-                                    title = post.title or ""
-                                    selftext = getattr(post, 'selftext', '') or ""
-                                    combined_text = f"{title} {selftext}"
-                                    
-                                    is_relevant, matched_keywords = self._is_voice_ai_related(combined_text)
-                                    
-                                    if is_relevant:
-                                        sentiment, sentiment_emoji = simple_sentiment_analysis(combined_text)
-                                        summary = simple_summarize(combined_text)
-                                        
-                                        external_url = None
-                                        if hasattr(post, 'url') and post.url:
-                                            if not post.url.startswith('https://www.reddit.com'):
-                                                external_url = post.url
-                                        
-                                        post_data = {
-                                            'platform': 'reddit',
-                                            'subreddit': subreddit_name,
-                                            'title': title,
-                                            'content': selftext[:300] if selftext else "",
-                                            'url': f"https://reddit.com{post.permalink}",
-                                            'author': str(post.author) if post.author else '[deleted]',
-                                            'score': getattr(post, 'score', 0),
-                                            'num_comments': getattr(post, 'num_comments', 0),
-                                            'created_utc': getattr(post, 'created_utc', 0),
-                                            'created_date': datetime.fromtimestamp(getattr(post, 'created_utc', 0)).strftime('%Y-%m-%d %H:%M'),
-                                            'sentiment': sentiment,
-                                            'sentiment_emoji': sentiment_emoji,
-                                            'summary': summary,
-                                            'matched_keywords': matched_keywords,
-                                            'external_url': external_url
-                                        }
-                                        
-                                        # Calculate relevance score
-                                        post_data['relevance_score'] = self._calculate_post_score(post_data)
-                                        
-                                        all_posts.append(post_data)
-                                        posts_found += 1
-                                        logger.info(f"📝 Found: {title[:60]}... (score: {post_data['relevance_score']})")
-                                        
-                                        # Allow up to 4 posts per subreddit per source
-                                        if posts_found >= 4:
-                                            break
-                                
-                                except Exception as post_error:
-                                    logger.warning(f"Error processing post: {post_error}")
-                                    continue
-                        
-                        except Exception as source_error:
-                            logger.warning(f"Error with {source_name} posts in r/{subreddit_name}: {source_error}")
-                            continue
-                    
-                    logger.info(f"✅ r/{subreddit_name}: checked {posts_checked}, found {posts_found}")
-                
-                except Exception as subreddit_error:
-                    logger.warning(f"Error accessing r/{subreddit_name}: {subreddit_error}")
-                    continue
+                # PRAW is synchronous (and not thread-safe), so scan one subreddit
+                # at a time in a worker thread to keep the event loop free
+                posts, posts_checked = await asyncio.to_thread(self._scan_subreddit, subreddit_name)
+                all_posts.extend(posts)
+                total_posts_checked += posts_checked
                 
                 await asyncio.sleep(1)  # Rate limiting
                 
@@ -355,8 +373,7 @@ class EnhancedRedditScraper:
                 continue
         
         # Sort by relevance score and take top posts
-        all_posts.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        top_posts = all_posts[:20]  # Keep top 20 posts
+        top_posts = heapq.nlargest(20, all_posts, key=lambda x: x.get('relevance_score', 0))  # Keep top 20 posts
         
         logger.info(f"🎯 Reddit scraping completed: {len(top_posts)} posts selected from {len(all_posts)} found")
         
@@ -377,6 +394,7 @@ class EnhancedRedditScraper:
     
     def _get_mock_reddit_data(self) -> List[Dict]:
         """Get mock Reddit data for email testing"""
+        created_date = datetime.now().strftime('%Y-%m-%d %H:%M')
         return [
             {
                 'platform': 'reddit',
@@ -387,7 +405,7 @@ class EnhancedRedditScraper:
                 'author': 'ai_researcher',
                 'score': 156,
                 'num_comments': 23,
-                'created_date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+                'created_date': created_date,
                 'sentiment': 'positive',
                 'sentiment_emoji': '😊',
                 'summary': 'Breakthrough in neural voice synthesis achieves human-like quality with minimal training data.',
@@ -408,7 +426,7 @@ class EnhancedRedditScraper:
                 'author': 'tech_enthusiast',
                 'score': 89,
                 'num_comments': 15,
-                'created_date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+                'created_date': created_date,
                 'sentiment': 'positive',
                 'sentiment_emoji': '😊',
                 'summary': 'ElevenLabs releases new real-time voice cloning API with improved quality and reduced latency.',
@@ -424,7 +442,7 @@ class EnhancedRedditScraper:
                 'author': 'ethics_watcher',
                 'score': 67,
                 'num_comments': 31,
-                'created_date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+                'created_date': created_date,
                 'sentiment': 'negative',
                 'sentiment_emoji': '😟',
                 'summary': 'Discussion about ethical implications of AI voice technology and deepfake concerns.',
@@ -433,12 +451,16 @@ class EnhancedRedditScraper:
             }
         ]
 
-# Create global instance
-_reddit_scraper = EnhancedRedditScraper()
+@lru_cache(maxsize=1)
+def get_reddit_scraper() -> EnhancedRedditScraper:
+    """Get the shared scraper, creating its authenticated PRAW client on first use"""
+    return EnhancedRedditScraper()
 
 async def scrape_reddit(news_items: Optional[List] = None) -> List[Dict]:
     """Enhanced Reddit scraping with guaranteed content for emails"""
-    return await _reddit_scraper.scrape_reddit(news_items)
+    # Building the PRAW client runs a blocking network probe - keep it off the event loop
+    scraper = await asyncio.to_thread(get_reddit_scraper)
+    return await scraper.scrape_reddit(news_items)
 
 # Test function
 async def test_reddit():
@@ -41,8 +41,15 @@ except Exception as e:
     reactions_collection = None
     runs_collection = None
 
-# Create data directory for file storage
-Path('data').mkdir(exist_ok=True)
+# orjson is optional - much faster for the JSON files that get re-read and rewritten every run
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Create data directory for file storage (DATA_DIR lets tests point it somewhere disposable)
+DATA_DIR = Path(os.getenv('DATA_DIR', 'data'))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 async def test_mongodb_connection():
     """Test if MongoDB is available"""
@@ -63,9 +70,12 @@ async def test_mongodb_connection():
 
 def load_file_data(filename):
     """Load data from JSON file"""
-    filepath = Path('data') / f"{filename}.json"
+    filepath = DATA_DIR / f"{filename}.json"
     if filepath.exists():
         try:
+            if orjson is not None:
+                with open(filepath, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(filepath, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
@@ -74,8 +84,12 @@ def load_file_data(filename):
 
 def save_file_data(filename, data):
     """Save data to JSON file"""
-    filepath = Path('data') / f"{filename}.json"
+    filepath = DATA_DIR / f"{filename}.json"
     try:
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return True
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, default=str, ensure_ascii=False)
         return True
@@ -85,77 +99,127 @@ def save_file_data(filename, data):
 
 async def store_news_item(news_item):
     """Store a news item in the database or file"""
+    ids = await store_news_items([news_item])
+    return ids[0] if ids else None
+
+async def store_news_items(news_items_to_store):
+    """Store a batch of news items - the file is loaded and saved once for the whole batch"""
     try:
-        # Add unique ID and timestamp
-        if '_id' not in news_item:
-            news_item['_id'] = str(uuid.uuid4())
-        
-        news_item['stored_at'] = datetime.now().isoformat()
-        
         # Always use file storage for now (more reliable)
         news_items = load_file_data('news_items')
         
-        # Check if item exists
-        existing_index = None
+        # Index existing items by URL (first occurrence wins, like a linear scan)
+        index_by_url = {}
         for i, item in enumerate(news_items):
-            if item.get('url') == news_item['url']:
-                existing_index = i
-                break
+            index_by_url.setdefault(item.get('url'), i)
         
-        if existing_index is not None:
-            news_items[existing_index] = news_item
-            logger.info(f"Updated existing news item: {news_item['title']}")
-        else:
-            news_items.append(news_item)
-            logger.info(f"Stored new news item: {news_item['title']}")
+        stored_at = datetime.now().isoformat()
+        ids = []
+        updated = 0
+        for news_item in news_items_to_store:
+            # Add unique ID and timestamp
+            if '_id' not in news_item:
+                news_item['_id'] = str(uuid.uuid4())
+            
+            news_item['stored_at'] = stored_at
+            
+            # Check if item exists
+            existing_index = index_by_url.get(news_item['url'])
+            
+            if existing_index is not None:
+                news_items[existing_index] = news_item
+                updated += 1
+            else:
+                index_by_url[news_item['url']] = len(news_items)
+                news_items.append(news_item)
+            
+            ids.append(news_item['_id'])
         
         save_file_data('news_items', news_items)
-        return news_item['_id']
+        logger.info(f"Stored {len(ids) - updated} new and updated {updated} existing news items")
+        return ids
         
     except Exception as e:
-        logger.error(f"Error storing news item: {str(e)}")
-        return None
+        logger.error(f"Error storing news items: {str(e)}")
+        return []
 
 async def store_reaction(reaction):
     """Store a reaction in the database or file"""
+    ids = await store_reactions([reaction])
+    return ids[0] if ids else None
+
+async def store_reactions(reactions_to_store):
+    """Store a batch of reactions - the file is loaded and saved once for the whole batch"""
     try:
-        # Add unique ID and timestamp
-        if '_id' not in reaction:
-            reaction['_id'] = str(uuid.uuid4())
-        
-        reaction['stored_at'] = datetime.now().isoformat()
-        
         # Always use file storage for now
         reactions = load_file_data('reactions')
         
-        # Check if reaction exists
-        existing_index = None
+        # A reaction matches an existing one by URL or by content (first occurrence wins)
+        index_by_url = {}
+        index_by_content = {}
         for i, item in enumerate(reactions):
-            if item.get('url') == reaction.get('url') or item.get('content') == reaction.get('content'):
-                existing_index = i
-                break
+            index_by_url.setdefault(item.get('url'), i)
+            index_by_content.setdefault(item.get('content'), i)
         
-        if existing_index is not None:
-            reactions[existing_index] = reaction
-            logger.info(f"Updated existing reaction")
-        else:
-            reactions.append(reaction)
-            logger.info(f"Stored new reaction")
+        stored_at = datetime.now().isoformat()
+        ids = []
+        updated = 0
+        for reaction in reactions_to_store:
+            # Add unique ID and timestamp
+            if '_id' not in reaction:
+                reaction['_id'] = str(uuid.uuid4())
+            
+            reaction['stored_at'] = stored_at
+            
+            # Check if reaction exists
+            matches = [
+                index for index in (index_by_url.get(reaction.get('url')), index_by_content.get(reaction.get('content')))
+                if index is not None
+            ]
+            
+            if matches:
+                index = min(matches)
+                replaced = reactions[index]
+                reactions[index] = reaction
+                # Keep both indexes as they would be if rebuilt from the updated list
+                for field, key_index in (('url', index_by_url), ('content', index_by_content)):
+                    old_key, new_key = replaced.get(field), reaction.get(field)
+                    if old_key != new_key and key_index.get(old_key) == index:
+                        _reindex_key(key_index, reactions, field, old_key)
+                    if key_index.get(new_key, index) >= index:
+                        key_index[new_key] = index
+                updated += 1
+            else:
+                index_by_url.setdefault(reaction.get('url'), len(reactions))
+                index_by_content.setdefault(reaction.get('content'), len(reactions))
+                reactions.append(reaction)
+            
+            ids.append(reaction['_id'])
         
         save_file_data('reactions', reactions)
-        return reaction['_id']
+        logger.info(f"Stored {len(ids) - updated} new and updated {updated} existing reactions")
+        return ids
         
     except Exception as e:
-        logger.error(f"Error storing reaction: {str(e)}")
-        return None
+        logger.error(f"Error storing reactions: {str(e)}")
+        return []
+
+def _reindex_key(key_index, items, field, key):
+    """Point key_index[key] at the first item still carrying that key, or drop it"""
+    for i, item in enumerate(items):
+        if item.get(field) == key:
+            key_index[key] = i
+            return
+    key_index.pop(key, None)
 
 async def store_run_summary(run_data):
     """Store a summary of this run for trend analysis"""
     try:
+        now = datetime.now()  # one clock read so timestamp and date agree
         run_summary = {
             '_id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'timestamp': now.isoformat(),
+            'date': now.strftime('%Y-%m-%d'),
             'articles_found': run_data.get('articles_found', 0),
             'articles_processed': run_data.get('articles_processed', 0),
             'reddit_posts': run_data.get('reddit_posts', 0),
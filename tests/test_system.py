@@ -2,12 +2,16 @@
 Comprehensive system test for AI Voice News Scraper
 """
 import asyncio
+import copy
 import logging
 import sys
 import os
+import tempfile
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 import unittest
+from unittest.mock import patch
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -34,15 +38,10 @@ class SystemTester:
         required_vars = ['OPENAI_API_KEY', 'MONGODB_URI', 'EMAIL_FROM', 'EMAIL_TO']
         optional_vars = ['REDDIT_CLIENT_ID', 'TWITTER_BEARER_TOKEN', 'SLACK_API_TOKEN']
         
-        missing_required = []
-        for var in required_vars:
-            if not os.getenv(var):
-                missing_required.append(var)
-        
-        missing_optional = []
-        for var in optional_vars:
-            if not os.getenv(var):
-                missing_optional.append(var)
+        # Read each variable once; empty values count as missing
+        env = {var: os.getenv(var) for var in required_vars + optional_vars}
+        missing_required = [var for var in required_vars if not env[var]]
+        missing_optional = [var for var in optional_vars if not env[var]]
         
         if missing_required:
             logger.error(f"❌ Missing required variables: {', '.join(missing_required)}")
@@ -60,7 +59,7 @@ class SystemTester:
         logger.info("📰 Testing News Scraping")
         
         try:
-            from ai_voice_scraper.scrapers.news_scraper import scrape_news_sources
+            from scrapers.news_scraper import scrape_news_sources
             news_items = await scrape_news_sources()
             
             if news_items:
@@ -83,36 +82,27 @@ class SystemTester:
         """Test content processing"""
         logger.info("🔍 Testing Content Processing")
         
-        if not os.getenv('OPENAI_API_KEY'):
-            logger.warning("⚠️ OpenAI API key not configured, skipping content processing test")
-            self.results['content_processing'] = False
-            return False
-        
         try:
-            from ai_voice_scraper.processors.content_processor import process_content
+            import processors.content_processor as cp
             
             # Create a test article about voice AI
             test_article = {
                 'title': 'New Voice AI Technology Breakthrough',
-                'url': 'https://example.com/test',
+                'url': 'https://example.com/test-voice-ai',
                 'source': 'Test Source',
                 'published_date': datetime.now().isoformat(),
                 'content': 'This article discusses new developments in voice AI technology, including text-to-speech synthesis and voice cloning capabilities.',
                 'raw_html': ''
             }
             
-            # Mock the fetch_article_content function to return our test content
-            import ai_voice_scraper.processors.content_processor as cp
-            original_fetch = cp.fetch_article_content
-            
-            async def mock_fetch(url):
+            # Stub the network: serve our test content instead of fetching, and take the
+            # local summary path instead of calling OpenAI
+            async def mock_fetch(url, session=None):
                 return test_article['content']
-            cp.fetch_article_content = mock_fetch
-            
-            processed = await process_content(test_article)
             
-            # Restore original function
-            cp.fetch_article_content = original_fetch
+            with patch.object(cp, 'fetch_article_content', mock_fetch), \
+                    patch.object(cp, 'OPENAI_API_KEY', None):
+                processed = await cp.process_content(test_article)
             
             if processed and 'summary' in processed:
                 logger.info("✅ Content processing successful")
@@ -138,7 +128,7 @@ class SystemTester:
             return False
         
         try:
-            from ai_voice_scraper.scrapers.reddit_scraper import scrape_reddit
+            from scrapers.reddit_scraper import scrape_reddit
             reactions = await scrape_reddit()
             
             logger.info(f"✅ Reddit scraping successful: {len(reactions)} reactions found")
@@ -164,7 +154,7 @@ class SystemTester:
             return False
         
         try:
-            from ai_voice_scraper.storage.db_manager import store_news_item
+            import storage.db_manager as db_manager
             
             test_item = {
                 'title': 'Test Article',
@@ -175,7 +165,10 @@ class SystemTester:
                 'summary': 'Test summary'
             }
             
-            result = await store_news_item(test_item)
+            # Write to a throwaway directory instead of the real data files
+            with tempfile.TemporaryDirectory() as tmp_dir, \
+                    patch.object(db_manager, 'DATA_DIR', Path(tmp_dir)):
+                result = await db_manager.store_news_item(test_item)
             if result:
                 logger.info("✅ Database connection successful")
                 self.results['database'] = True
@@ -200,15 +193,16 @@ class SystemTester:
             return False
         
         try:
-            from ai_voice_scraper.notifiers.email_notifier import send_email_digest
+            from notifiers.email_notifier import send_email_digest
             
+            now = datetime.now()
             test_digest = {
-                'date': datetime.now().strftime("%Y-%m-%d"),
+                'date': now.strftime("%Y-%m-%d"),
                 'news_items': [{
                     'title': 'Test Voice AI News',
                     'url': 'https://example.com',
                     'source': 'Test Source',
-                    'published_date': datetime.now().isoformat(),
+                    'published_date': now.isoformat(),
                     'summary': 'This is a test summary for voice AI news.'
                 }],
                 'reactions': []
@@ -233,13 +227,15 @@ class SystemTester:
         logger.info("🧪 Starting AI Voice News Scraper System Tests")
         logger.info("=" * 60)
         
-        # Run all tests
+        # Run all tests - the rest talk to unrelated services, so run them concurrently
         await self.test_environment()
-        await self.test_news_scraping()
-        await self.test_content_processing()
-        await self.test_reddit_scraping()
-        await self.test_database()
-        await self.test_email_notification()
+        await asyncio.gather(
+            self.test_news_scraping(),
+            self.test_content_processing(),
+            self.test_reddit_scraping(),
+            self.test_database(),
+            self.test_email_notification()
+        )
         
         # Print summary
         logger.info("\n" + "=" * 60)
@@ -285,10 +281,181 @@ class TestAIVoiceScraper(unittest.TestCase):
         passed, total = asyncio.run(tester.run_all_tests())
         self.assertGreaterEqual(passed, 3, "At least core functionality should work")
 
+class FakeSMTPServer:
+    """Scripted stand-in for smtplib.SMTP - each sendmail call pops the next outcome"""
+    
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.sock = object()
+        self.calls = 0
+        self.messages = []
+    
+    def sendmail(self, email_from, recipients, message):
+        self.calls += 1
+        self.messages.append(message)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            if getattr(outcome, 'smtp_code', None) == 421:
+                self.sock = None  # smtplib closes the connection before raising a 421
+            raise outcome
+        return outcome
+    
+    def quit(self):
+        self.sock = None
+    
+    def close(self):
+        self.sock = None
+
+class TestSMTPBackoff(unittest.TestCase):
+    """Retry behaviour of the individual-send fallback"""
+    
+    def test_refused_recipient_is_retried(self):
+        """A 450/452 RCPT refusal is retried on the same connection"""
+        import smtplib
+        import notifiers.email_notifier as email_notifier
+        
+        server = FakeSMTPServer([smtplib.SMTPRecipientsRefused({'a@example.com': (452, b'try later')}), {}])
+        with patch.object(email_notifier, '_connect_smtp', return_value=server), \
+             patch.object(email_notifier.time, 'sleep'):
+            session = email_notifier.SMTPSession('smtp.example.com', 587, 'user', 'pass')
+            result = email_notifier._sendmail_with_backoff(session, 'me@example.com', ['a@example.com'], b'msg')
+        
+        self.assertEqual(result, {})
+        self.assertEqual(server.calls, 2)
+        self.assertIs(session.server, server)
+    
+    def test_421_reconnects_before_retrying(self):
+        """A 421 closes the connection, so the retry and later recipients use a fresh one"""
+        import smtplib
+        import notifiers.email_notifier as email_notifier
+        
+        dropped = FakeSMTPServer([smtplib.SMTPSenderRefused(421, b'closing', 'me@example.com')])
+        fresh = FakeSMTPServer([{}, {}])
+        with patch.object(email_notifier, '_connect_smtp', side_effect=[dropped, fresh]), \
+             patch.object(email_notifier.time, 'sleep'):
+            session = email_notifier.SMTPSession('smtp.example.com', 587, 'user', 'pass')
+            self.assertEqual(email_notifier._sendmail_with_backoff(session, 'me@example.com', ['a@example.com'], b'msg'), {})
+            self.assertEqual(email_notifier._sendmail_with_backoff(session, 'me@example.com', ['b@example.com'], b'msg'), {})
+        
+        self.assertEqual(dropped.calls, 1)
+        self.assertEqual(fresh.calls, 2)
+        self.assertIs(session.server, fresh)
+
+class TestDigestLineEndings(unittest.TestCase):
+    """Digest messages must reach sendmail with CRLF line endings (smtplib won't fix bytes)"""
+    
+    def assert_crlf_only(self, message):
+        self.assertIsInstance(message, bytes)
+        self.assertIn(b'\r\n', message)
+        self.assertNotIn(b'\n', message.replace(b'\r\n', b''))
+    
+    def test_bulk_send_uses_crlf(self):
+        import notifiers.email_notifier as email_notifier
+        
+        server = FakeSMTPServer([{}])
+        email_notifier._send_all_as_to_recipients_sync(
+            server, 'me@example.com', ['a@example.com', 'b@example.com'], '2024-01-01', '<p>line one\nline two</p>'
+        )
+        self.assert_crlf_only(server.messages[0])
+    
+    def test_individual_send_uses_crlf(self):
+        import notifiers.email_notifier as email_notifier
+        
+        server = FakeSMTPServer([{}, {}])
+        with patch.object(email_notifier, '_connect_smtp', return_value=server):
+            session = email_notifier.SMTPSession('smtp.example.com', 587, 'user', 'pass')
+            email_notifier._send_individually_sync(
+                session, 'me@example.com', ['a@example.com', 'b@example.com'], '2024-01-01', '<p>line one\nline two</p>'
+            )
+        self.assertEqual(len(server.messages), 2)
+        for message in server.messages:
+            self.assert_crlf_only(message)
+
+class TestBatchStorage(unittest.TestCase):
+    """Batched store_* calls must leave the same records as storing the items one at a time"""
+    
+    def stored_records(self, collection, existing, items, store_batch=None, store_one=None):
+        """Store `items` on top of `existing` in a throwaway directory and return (title, url, content) per record"""
+        import storage.db_manager as db_manager
+        
+        async def store():
+            if store_batch:
+                await store_batch(copy.deepcopy(items))
+            else:
+                for item in copy.deepcopy(items):
+                    await store_one(item)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch.object(db_manager, 'DATA_DIR', Path(tmp_dir)):
+            db_manager.save_file_data(collection, copy.deepcopy(existing))
+            asyncio.run(store())
+            return [(item['title'], item.get('url'), item.get('content')) for item in db_manager.load_file_data(collection)]
+    
+    def assert_batch_matches_single(self, collection, existing, items, expected_titles=None):
+        import storage.db_manager as db_manager
+        
+        store_batch, store_one = {
+            'reactions': (db_manager.store_reactions, db_manager.store_reaction),
+            'news_items': (db_manager.store_news_items, db_manager.store_news_item),
+        }[collection]
+        batched = self.stored_records(collection, existing, items, store_batch=store_batch)
+        single = self.stored_records(collection, existing, items, store_one=store_one)
+        self.assertEqual(batched, single)
+        if expected_titles is not None:
+            self.assertEqual([title for title, _, _ in batched], expected_titles)
+    
+    def test_replaced_keys_are_reindexed(self):
+        """A replaced record's old url/content stop matching and its new ones start matching"""
+        existing = [{'title': 'A', 'url': 'u1', 'content': 'c1'}]
+        items = [
+            {'title': 'R1', 'url': 'u2', 'content': 'c1'},
+            {'title': 'R2', 'url': 'u2', 'content': 'c3'},
+            {'title': 'R3', 'url': 'u1', 'content': 'c9'},
+        ]
+        self.assert_batch_matches_single('reactions', existing, items, expected_titles=['R2', 'R3'])
+        self.assert_batch_matches_single('news_items', existing, items)
+    
+    def test_missing_url_and_content(self):
+        """Records without a url or content match each other on None, same as single-item storage"""
+        existing = [
+            {'title': 'A', 'url': None, 'content': 'c1'},
+            {'title': 'B', 'url': 'u1'},
+        ]
+        items = [
+            {'title': 'R1', 'content': 'c2'},
+            {'title': 'R2', 'url': 'u1', 'content': None},
+            {'title': 'R3', 'url': 'u3', 'content': 'c1'},
+            {'title': 'R4', 'url': 'u4'},
+        ]
+        self.assert_batch_matches_single('reactions', existing, items)
+    
+    def test_same_record_replaced_repeatedly(self):
+        """Keys shared with later records move to the next record once the first is replaced"""
+        existing = [
+            {'title': 'A', 'url': 'u1', 'content': 'c1'},
+            {'title': 'B', 'url': 'u2', 'content': 'c2'},
+            {'title': 'C', 'url': 'u1', 'content': 'c3'},
+        ]
+        items = [
+            {'title': 'R1', 'url': 'u1', 'content': 'c4'},
+            {'title': 'R2', 'url': 'u5', 'content': 'c1'},
+            {'title': 'R3', 'url': 'u1', 'content': 'c2'},
+            {'title': 'R4', 'url': 'u9', 'content': 'c4'},
+            {'title': 'R5', 'url': 'u1', 'content': 'c3'},
+        ]
+        self.assert_batch_matches_single('reactions', existing, items)
+
 async def main():
     """Main test function"""
     tester = SystemTester()
     await tester.run_all_tests()
 
 if __name__ == "__main__":
+    # Same optional uvloop event loop as the CLI
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())